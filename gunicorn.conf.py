@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration for the Q&A Support Bot API
+Usage: gunicorn -c gunicorn.conf.py src.api:app
+"""
+import logging
+import os
+
+# Configured in the master before forking, so every worker inherits it
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
+
+bind = f"0.0.0.0:{os.getenv('FLASK_PORT', 5000)}"
+
+# Encoding queries is CPU-bound, so throughput comes from worker processes;
+# a few threads per worker only overlap request I/O and vector DB lookups
+worker_class = 'gthread'
+workers = int(os.getenv('GUNICORN_WORKERS', os.cpu_count() or 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+timeout = 120
+
+
+def post_fork(server, worker):
+    """Initialize RAG components once in every worker process"""
+    # Split the cores between workers: torch's intra-op pool defaults to all
+    # of them in every process, which oversubscribes the CPU workers-fold
+    import torch
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // server.cfg.workers))
+    
+    from src.api import initialize_components
+    initialize_components()
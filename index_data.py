@@ -3,6 +3,7 @@
 Main entry point for indexing website content
 Usage: python index_data.py
 """
+import logging
 import os
 import sys
 from dotenv import load_dotenv
@@ -11,10 +12,16 @@ from src.pipeline import IndexingPipeline
 # Load environment variables
 load_dotenv()
 
+# Logging is configured here, by the application, not by library modules
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
+
 def main():
     """Main function"""
     website_url = os.getenv('TARGET_WEBSITE')
     db_path = os.getenv('VECTOR_DB_PATH', './data/chroma_db')
+    cache_path = os.getenv('EMBEDDINGS_CACHE_PATH', './data/embeddings_cache.db')
+    crawl_workers = int(os.getenv('CRAWL_WORKERS', 4))
+    crawl_delay = float(os.getenv('CRAWL_DELAY', 0.5))
     
     if not website_url:
         print("ERROR: TARGET_WEBSITE not set in .env file")
@@ -27,6 +34,7 @@ def main():
     print(f"\nConfiguration:")
     print(f"  Target Website: {website_url}")
     print(f"  Database Path: {db_path}")
+    print(f"  Crawl: {crawl_workers} workers, {crawl_delay}s between requests")
     print(f"\nStarting indexing process...")
     print("=" * 70 + "\n")
     
@@ -34,7 +42,10 @@ def main():
         pipeline = IndexingPipeline(
             website_url=website_url,
             db_path=db_path,
-            max_pages=50
+            max_pages=50,
+            cache_path=cache_path,
+            crawl_workers=crawl_workers,
+            crawl_delay=crawl_delay
         )
         success = pipeline.run()
         
@@ -3,6 +3,7 @@
 Main entry point for running the Flask API server
 Usage: python run_api.py
 """
+import logging
 import os
 import sys
 from dotenv import load_dotenv
@@ -10,6 +11,9 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Logging is configured here, by the application, not by library modules
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
+
 def main():
     """Main function"""
     port = int(os.getenv('FLASK_PORT', 5000))
@@ -29,10 +33,31 @@ def main():
     print(f"  GET  http://localhost:{port}/health")
     print(f"  GET  http://localhost:{port}/api/stats")
     print(f"  POST http://localhost:{port}/api/ask")
+    print(f"  POST http://localhost:{port}/api/ask/batch")
     print(f"\nPress CTRL+C to stop the server")
     print("=" * 70 + "\n")
     
     try:
+        if not debug and os.name == 'nt':
+            # gunicorn relies on POSIX fork and does not run on Windows
+            print("WARNING: gunicorn is not supported on Windows; "
+                  "falling back to the Flask server")
+        elif not debug:
+            # Production: hand the process over to gunicorn's threaded workers
+            root = os.path.dirname(os.path.abspath(__file__))
+            try:
+                os.execvp('gunicorn', [
+                    'gunicorn',
+                    '--chdir', root,
+                    '-c', os.path.join(root, 'gunicorn.conf.py'),
+                    '-b', f'0.0.0.0:{port}',
+                    'src.api:app'
+                ])
+            except OSError as e:
+                print(f"WARNING: Could not start gunicorn ({e}); "
+                      "falling back to the Flask server")
+                print("To serve with gunicorn, run: pip install -r requirements.txt")
+        
         # Import and run the Flask app
         from src.api import app, initialize_components
         
@@ -4,36 +4,111 @@ Provides endpoints for querying the RAG system
 """
 import os
 import logging
+import threading
+import time
+from itertools import repeat
 from flask import Flask, request, jsonify
 from dotenv import load_dotenv
 from src.embeddings import EmbeddingsGenerator
+from src.embeddings_cache import CachedEmbeddingsGenerator
+from src.semantic_cache import SemanticCache
 from src.vector_db import VectorDatabase
 
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__)
 
+# Upper bound on the number of questions accepted by /api/ask/batch
+MAX_BATCH_QUESTIONS = int(os.getenv('MAX_BATCH_QUESTIONS', 64))
+# Upper bound on the number of documents returned per question
+MAX_TOP_K = int(os.getenv('MAX_TOP_K', 50))
+
 # Initialize components
 vector_db = None
 embeddings_gen = None
+semantic_cache = None
+# Seconds between checks of the index's metadata.json for a re-index
+_INDEX_CHECK_INTERVAL = 30.0
+_index_path = None
+_index_mtime = None
+_index_checked_at = float('-inf')
+_index_lock = threading.Lock()
+_init_lock = threading.Lock()
 
 
 def initialize_components():
-    """Initialize RAG components"""
-    global vector_db, embeddings_gen
+    """Initialize RAG components (once per process)"""
+    global vector_db, embeddings_gen, semantic_cache, _index_path
+    
+    with _init_lock:
+        if vector_db is not None:
+            return
+        
+        db_path = os.getenv('VECTOR_DB_PATH', './data/chroma_db')
+        cache_path = os.getenv('EMBEDDINGS_CACHE_PATH', './data/embeddings_cache.db')
+        
+        logger.info("Initializing RAG components...")
+        embeddings_gen = CachedEmbeddingsGenerator(EmbeddingsGenerator(), cache_path)
+        semantic_cache = SemanticCache()
+        # Rewritten by the indexing pipeline at the end of every run
+        _index_path = os.path.join(db_path, 'metadata.json')
+        # Published last: a non-None vector_db means everything is ready
+        db = VectorDatabase(db_path)
+        db.create_collection()
+        vector_db = db
+        logger.info("Components initialized successfully")
+
+
+def get_vector_db() -> VectorDatabase:
+    """Return the process-wide vector database, initializing on first use"""
+    if vector_db is None:
+        initialize_components()
+    return vector_db
+
+
+def get_embeddings_gen() -> CachedEmbeddingsGenerator:
+    """Return the process-wide embeddings generator, initializing on first use"""
+    if vector_db is None:
+        initialize_components()
+    return embeddings_gen
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Return the process-wide semantic cache, initializing on first use"""
+    global _index_mtime, _index_checked_at
     
-    db_path = os.getenv('VECTOR_DB_PATH', './data/chroma_db')
+    if vector_db is None:
+        initialize_components()
     
-    logger.info("Initializing RAG components...")
-    embeddings_gen = EmbeddingsGenerator()
-    vector_db = VectorDatabase(db_path)
-    vector_db.create_collection()
-    logger.info("Components initialized successfully")
+    # Answers cached before a re-index are dropped. The check is a stat of
+    # metadata.json at most every _INDEX_CHECK_INTERVAL seconds, so cache
+    # hits stay off the database; entries otherwise expire by TTL
+    now = time.monotonic()
+    if now - _index_checked_at >= _INDEX_CHECK_INTERVAL:
+        with _index_lock:
+            if now - _index_checked_at >= _INDEX_CHECK_INTERVAL:
+                _index_checked_at = now
+                try:
+                    mtime = os.path.getmtime(_index_path)
+                except OSError:
+                    mtime = None
+                if mtime != _index_mtime:
+                    semantic_cache.clear()
+                    _index_mtime = mtime
+    return semantic_cache
+
+
+def _parse_top_k(data: dict):
+    """Return the requested top_k, or None if it is not an int in [1, MAX_TOP_K]"""
+    top_k = data.get('top_k', 5)
+    if isinstance(top_k, bool) or not isinstance(top_k, int):
+        return None
+    if not 1 <= top_k <= MAX_TOP_K:
+        return None
+    return top_k
 
 
 @app.route('/health', methods=['GET'])
@@ -45,6 +120,27 @@ def health_check():
     }), 200
 
 
+def _format_results(results, query_index: int = 0) -> list:
+    """Format the ChromaDB results of one query as ranked documents"""
+    if not (results and results['documents'] and len(results['documents']) > query_index):
+        return []
+    
+    documents = results['documents'][query_index]
+    metadatas = results['metadatas'][query_index]
+    # Resolve the per-query rows once and walk them together in one pass
+    # instead of re-indexing the nested result lists for every document
+    distances = (map(float, results['distances'][query_index])
+                 if results['distances'] else repeat(None))
+    
+    return [{
+        'rank': rank,
+        'content': doc,
+        'source': metadata['source'],
+        'distance': distance
+    } for rank, (doc, metadata, distance)
+        in enumerate(zip(documents, metadatas, distances), 1)]
+
+
 @app.route('/api/ask', methods=['POST'])
 def ask_question():
     """
@@ -70,26 +166,28 @@ def ask_question():
                 'error': 'Question cannot be empty'
             }), 400
         
-        top_k = data.get('top_k', 5)
+        top_k = _parse_top_k(data)
+        if top_k is None:
+            return jsonify({
+                'error': f'"top_k" must be an integer between 1 and {MAX_TOP_K}'
+            }), 400
         
-        logger.info(f"Processing question: {question}")
+        logger.debug("Processing question: %s", question)
         
         # Generate embedding for the question
-        question_embedding = embeddings_gen.generate_single_embedding(question)
-        
-        # Search in vector database
-        results = vector_db.search(question_embedding, n_results=top_k)
-        
-        # Format response
-        retrieved_docs = []
-        if results and results['documents'] and len(results['documents']) > 0:
-            for i, doc in enumerate(results['documents'][0]):
-                retrieved_docs.append({
-                    'rank': i + 1,
-                    'content': doc,
-                    'source': results['metadatas'][0][i]['source'],
-                    'distance': float(results['distances'][0][i]) if results['distances'] else None
-                })
+        question_embedding = get_embeddings_gen().generate_single_embedding(question)
+        
+        # Reuse results of a near-duplicate question if one was seen recently
+        cache = get_semantic_cache()
+        retrieved_docs = cache.lookup(question_embedding, namespace=top_k)
+        
+        if retrieved_docs is None:
+            # Search in vector database
+            results = get_vector_db().search(question_embedding, n_results=top_k)
+            retrieved_docs = _format_results(results)
+            cache.add(question_embedding, retrieved_docs, namespace=top_k)
+        else:
+            logger.debug("Semantic cache hit")
         
         response = {
             'question': question,
@@ -98,7 +196,7 @@ def ask_question():
             'status': 'success'
         }
         
-        logger.info(f"Retrieved {len(retrieved_docs)} documents")
+        logger.debug("Retrieved %d documents", len(retrieved_docs))
         return jsonify(response), 200
         
     except Exception as e:
@@ -109,13 +207,95 @@ def ask_question():
         }), 500
 
 
+@app.route('/api/ask/batch', methods=['POST'])
+def ask_questions():
+    """
+    Ask several questions in one request
+    
+    Expected JSON:
+    {
+        "questions": ["First question", "Second question"],
+        "top_k": 5  (optional, default is 5)
+    }
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('questions'), list):
+            return jsonify({
+                'error': 'Missing "questions" list in request'
+            }), 400
+        
+        questions = data['questions']
+        if not all(isinstance(question, str) for question in questions):
+            return jsonify({
+                'error': 'Questions must be strings'
+            }), 400
+        
+        questions = [question.strip() for question in questions]
+        if not questions or not all(questions):
+            return jsonify({
+                'error': 'Questions cannot be empty'
+            }), 400
+        
+        if len(questions) > MAX_BATCH_QUESTIONS:
+            return jsonify({
+                'error': f'At most {MAX_BATCH_QUESTIONS} questions per request'
+            }), 400
+        
+        top_k = _parse_top_k(data)
+        if top_k is None:
+            return jsonify({
+                'error': f'"top_k" must be an integer between 1 and {MAX_TOP_K}'
+            }), 400
+        
+        logger.debug("Processing %d questions", len(questions))
+        
+        # Embed all questions in a single forward pass
+        embeddings = get_embeddings_gen().generate_query_embeddings(questions)
+        
+        cache = get_semantic_cache()
+        answers = [cache.lookup(embedding, namespace=top_k) for embedding in embeddings]
+        misses = [i for i, docs in enumerate(answers) if docs is None]
+        
+        if misses:
+            # One vector DB query for every question the cache could not answer
+            results = get_vector_db().search_batch(
+                embeddings[misses], n_results=top_k
+            )
+            for query_index, i in enumerate(misses):
+                answers[i] = _format_results(results, query_index)
+                cache.add(embeddings[i], answers[i], namespace=top_k)
+        
+        response = {
+            'results': [{
+                'question': question,
+                'retrieved_documents': docs,
+                'total_results': len(docs)
+            } for question, docs in zip(questions, answers)],
+            'status': 'success'
+        }
+        
+        logger.debug("Answered %d questions (%d from cache)",
+                     len(questions), len(questions) - len(misses))
+        return jsonify(response), 200
+        
+    except Exception as e:
+        logger.error(f"Error processing questions: {str(e)}")
+        return jsonify({
+            'error': 'Internal server error',
+            'message': str(e)
+        }), 500
+
+
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get statistics about the indexed content"""
     try:
+        db = get_vector_db()
         collection_stats = {
-            'collection_name': vector_db.collection.name if vector_db.collection else None,
-            'total_documents': vector_db.collection.count() if vector_db.collection else 0
+            'collection_name': db.collection.name if db.collection else None,
+            'total_documents': db.get_collection_count()
         }
         
         return jsonify({
@@ -150,6 +330,7 @@ def internal_error(error):
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
     initialize_components()
     port = int(os.getenv('FLASK_PORT', 5000))
     app.run(debug=True, host='0.0.0.0', port=port)
@@ -4,9 +4,41 @@ Cleans and preprocesses text content
 """
 import re
 import logging
+from typing import Iterator
 
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once at import and reused for every document
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\.\,\!\?\-\(\)\:\;]')
+_URL_RE = re.compile(r'http\S+|www\S+')
+# Email parts, matched around each '@' rather than tried at every position
+_EMAIL_LOCAL_RE = re.compile(r'[\w\.\+\-]+\Z')
+_EMAIL_DOMAIN_RE = re.compile(r'[\w\-]+(?:\.[\w\-]+)+')
+# Longest local part allowed by RFC 5321
+_MAX_EMAIL_LOCAL = 64
+
+
+def _strip_emails(text: str) -> str:
+    """Remove email addresses, scanning only around '@' characters"""
+    pieces = []
+    last = 0
+    at = text.find('@')
+    while at != -1:
+        local = _EMAIL_LOCAL_RE.search(text, max(last, at - _MAX_EMAIL_LOCAL), at)
+        domain = _EMAIL_DOMAIN_RE.match(text, at + 1)
+        if local and domain:
+            pieces.append(text[last:local.start()])
+            last = domain.end()
+            at = text.find('@', last)
+        else:
+            at = text.find('@', at + 1)
+    
+    if not pieces:
+        return text
+    pieces.append(text[last:])
+    return ''.join(pieces)
+
 
 class TextCleaner:
     @staticmethod
@@ -20,20 +52,17 @@ class TextCleaner:
         Returns:
             Cleaned text
         """
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters but keep alphanumeric, spaces, and basic punctuation
-        text = re.sub(r'[^\w\s\.\,\!\?\-\(\)\:\;]', '', text)
-        
         # Remove URLs
-        text = re.sub(r'http\S+|www\S+', '', text)
+        text = _URL_RE.sub('', text)
         
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
+        # Remove email addresses, before special characters take their '@'
+        text = _strip_emails(text)
         
-        # Strip leading/trailing whitespace
-        text = text.strip()
+        # Remove special characters but keep alphanumeric, spaces, and basic punctuation
+        text = _SPECIAL_CHARS_RE.sub('', text)
+        
+        # Collapse whitespace left behind and strip leading/trailing whitespace
+        text = _WHITESPACE_RE.sub(' ', text).strip()
         
         return text
     
@@ -50,30 +79,84 @@ class TextCleaner:
         Returns:
             List of text chunks
         """
-        chunks = []
+        return list(TextCleaner._iter_chunk_text(text, chunk_size, overlap))
+    
+    @staticmethod
+    def _iter_chunk_text(text: str, chunk_size: int, overlap: int) -> Iterator[str]:
         step = chunk_size - overlap
         
-        for i in range(0, len(text), step):
-            chunk = text[i:i + chunk_size]
-            if chunk.strip():
-                chunks.append(chunk)
+        # Windows are never empty, so isspace() alone rejects blank chunks
+        # without allocating a stripped copy of each one
+        return (chunk for chunk in
+                (text[i:i + chunk_size] for i in range(0, len(text), step))
+                if not chunk.isspace())
+    
+    @staticmethod
+    def chunk_tokens(text: str, tokenizer, chunk_size: int = 200,
+                     overlap: int = 20) -> list:
+        """
+        Split text into overlapping chunks on token boundaries
+        
+        Args:
+            text: Text to chunk
+            tokenizer: Fast Hugging Face tokenizer of the embedding model
+            chunk_size: Size of each chunk in tokens
+            overlap: Overlap between chunks in tokens
+            
+        Returns:
+            List of text chunks, sliced from the original text
+        """
+        return list(TextCleaner._iter_chunk_tokens(text, tokenizer, chunk_size, overlap))
+    
+    @staticmethod
+    def _iter_chunk_tokens(text: str, tokenizer, chunk_size: int,
+                           overlap: int) -> Iterator[str]:
+        offsets = tokenizer(text, add_special_tokens=False,
+                            return_offsets_mapping=True,
+                            verbose=False)['offset_mapping']
+        if not offsets:
+            return iter(())
+        
+        n_tokens = len(offsets)
+        step = chunk_size - overlap
         
-        return chunks
+        # Slice the original string by character offsets rather than
+        # decoding token ids, which would lowercase and re-space the text
+        return (text[offsets[i][0]:offsets[min(i + chunk_size, n_tokens) - 1][1]]
+                for i in range(0, max(n_tokens - overlap, 1), step))
     
     @staticmethod
     def process_content(content: str, chunk_size: int = 500, 
-                       overlap: int = 50) -> list:
+                       overlap: int = 50, tokenizer=None) -> list:
         """
         Complete processing pipeline: clean and chunk text
         
         Args:
             content: Raw content
-            chunk_size: Size of chunks
+            chunk_size: Size of chunks (in tokens when a tokenizer is given,
+                otherwise in characters)
             overlap: Overlap between chunks
+            tokenizer: Optional tokenizer to chunk on token boundaries
             
         Returns:
             List of processed chunks
         """
+        return list(TextCleaner.iter_process_content(content, chunk_size,
+                                                     overlap, tokenizer))
+    
+    @staticmethod
+    def iter_process_content(content: str, chunk_size: int = 500,
+                             overlap: int = 50, tokenizer=None) -> Iterator[str]:
+        """
+        Clean text and yield its chunks one at a time
+        
+        Same arguments as process_content; chunks are sliced lazily so a
+        caller consuming them never holds the page's full chunk list.
+        
+        Returns:
+            Iterator over processed chunks
+        """
         cleaned = TextCleaner.clean_text(content)
-        chunks = TextCleaner.chunk_text(cleaned, chunk_size, overlap)
-        return chunks
+        if tokenizer is not None:
+            return TextCleaner._iter_chunk_tokens(cleaned, tokenizer, chunk_size, overlap)
+        return TextCleaner._iter_chunk_text(cleaned, chunk_size, overlap)
@@ -3,49 +3,171 @@ Web Crawler Module
 Crawls website pages and extracts text content
 """
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from requests.adapters import HTTPAdapter
+from selectolax.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
 import logging
-from typing import Set, List, Dict
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Set, List, Dict, Iterator
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Paths that are never worth fetching: binary downloads and session endpoints
+_EXCLUDED_PATH_RE = re.compile(
+    r'\.(?:pdf|zip|gz|tar|exe|dmg|png|jpe?g|gif|svg|webp|ico|mp3|mp4|avi|mov|css|js)$'
+    r'|/(?:logout|login)/?$',
+    re.IGNORECASE
+)
+
+# Responses larger than this are not downloaded
+_MAX_PAGE_BYTES = 5 * 1024 * 1024
+
+# The same links appear on nearly every page of a site (navigation, footer),
+# so their parse results are memoized rather than recomputed per occurrence
+_split_url = lru_cache(maxsize=100_000)(urlsplit)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize a thread-safe token bucket
+        
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens that can accumulate
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until it becomes available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # The balance may go negative: each caller reserves its token
+            # and sleeps outside the lock, so waiters never queue on it
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        
+        if wait > 0:
+            time.sleep(wait)
+
 
 class WebCrawler:
-    def __init__(self, base_url: str, max_pages: int = 50):
+    def __init__(self, base_url: str, max_pages: int = 50,
+                 max_workers: int = 4, delay: float = 0.5, burst: int = 1):
         """
         Initialize web crawler
         
         Args:
             base_url: Starting URL to crawl
             max_pages: Maximum number of pages to crawl
+            max_workers: Number of pages fetched concurrently
+            delay: Average seconds between two requests to the same host
+                (0 disables the limit)
+            burst: Requests a host may receive back to back before `delay`
+                spacing applies
         """
         self.base_url = base_url
         self.max_pages = max_pages
+        self.max_workers = max_workers
+        self.delay = delay
+        self.burst = burst
         self.visited_urls: Set[str] = set()
         self.pages: List[Dict[str, str]] = []
-        self.domain = urlparse(base_url).netloc
+        self.domain = urlsplit(base_url).netloc
+        
+        # Shared session so TCP/TLS connections are reused across pages.
+        # Its default Accept-Encoding already asks for compressed HTML; 'br'
+        # is included only because brotli is listed in requirements.txt
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        })
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Per-host politeness: one token bucket refilled at 1/delay per host
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
         
     def is_valid_url(self, url: str) -> bool:
-        """Check if URL belongs to the same domain"""
+        """Check if URL belongs to the same domain and is worth crawling"""
         try:
-            parsed = urlparse(url)
-            return parsed.netloc == self.domain and parsed.scheme in ['http', 'https']
-        except:
+            parsed = _split_url(url)
+        except ValueError:
             return False
+        return (parsed.netloc == self.domain
+                and parsed.scheme in ('http', 'https')
+                and not _EXCLUDED_PATH_RE.search(parsed.path))
+    
+    def _text_from_tree(self, tree: HTMLParser) -> str:
+        """Extract text content from a parsed HTML tree"""
+        # Remove script and style elements in a single C-level pass
+        tree.strip_tags(['script', 'style'])
+        
+        # Get text
+        if tree.root is None:
+            return ""
+        return tree.root.text(separator=' ', strip=True)
+    
+    def _links_from_tree(self, tree: HTMLParser, page_url: str) -> List[str]:
+        """Extract same-domain links from a parsed HTML tree"""
+        links = []
+        
+        for node in tree.css('a[href]'):
+            href = node.attributes.get('href')
+            if not href:
+                continue
+            
+            url = urljoin(page_url, href)
+            # Remove fragments
+            url = url.split('#')[0]
+            
+            if self.is_valid_url(url) and url not in self.visited_urls:
+                links.append(url)
+        
+        return links
+    
+    def parse_page(self, html: str, page_url: str) -> tuple[str, List[str]]:
+        """
+        Parse a page once and extract both its text and its links
+        
+        Returns:
+            Tuple of (text, links)
+        """
+        tree = HTMLParser(html)
+        links = self._links_from_tree(tree, page_url)
+        text = self._text_from_tree(tree)
+        return text, links
     
     def extract_text_from_html(self, html: str) -> str:
         """Extract text content from HTML"""
-        soup = BeautifulSoup(html, 'html.parser')
+        return self._text_from_tree(HTMLParser(html))
+    
+    def _wait_for_host(self, url: str):
+        """Sleep until this host's rate limit allows another request"""
+        if self.delay <= 0:
+            return
         
-        # Remove script and style elements
-        for script in soup(['script', 'style']):
-            script.decompose()
+        host = _split_url(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(1 / self.delay, self.burst)
         
-        # Get text
-        text = soup.get_text(separator=' ', strip=True)
-        return text
+        bucket.acquire()
     
     def fetch_page(self, url: str) -> tuple[str, bool]:
         """
@@ -54,31 +176,46 @@ class WebCrawler:
         Returns:
             Tuple of (content, success_flag)
         """
+        self._wait_for_host(url)
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, timeout=10, headers=headers)
-            response.raise_for_status()
-            return response.text, True
-        except requests.RequestException as e:
+            # Stream so that non-HTML or oversized responses are dropped as
+            # soon as their headers arrive instead of being downloaded in full
+            with self.session.get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                
+                # Responses without a Content-Type are still parsed as HTML
+                content_type = response.headers.get('Content-Type', '')
+                content_length = int(response.headers.get('Content-Length') or 0)
+                if ((content_type and 'html' not in content_type)
+                        or content_length > _MAX_PAGE_BYTES):
+                    logger.info("Skipping %s: %s, %d bytes", url,
+                                content_type or 'unknown type', content_length)
+                    return "", False
+                
+                # Content-Length is absent for chunked responses and is the
+                # compressed size otherwise, so the limit is enforced on the
+                # decoded bytes as they are read
+                body = bytearray()
+                for block in response.iter_content(chunk_size=64 * 1024):
+                    body += block
+                    if len(body) > _MAX_PAGE_BYTES:
+                        logger.info("Skipping %s: larger than %d bytes",
+                                    url, _MAX_PAGE_BYTES)
+                        return "", False
+                
+                # The charset is copied verbatim from the header, so an
+                # unknown one falls back to UTF-8 as Response.text does
+                try:
+                    return body.decode(response.encoding or 'utf-8', errors='replace'), True
+                except LookupError:
+                    return body.decode('utf-8', errors='replace'), True
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Error fetching {url}: {str(e)}")
             return "", False
     
     def get_links_from_page(self, html: str, page_url: str) -> List[str]:
         """Extract all links from HTML page"""
-        soup = BeautifulSoup(html, 'html.parser')
-        links = []
-        
-        for link in soup.find_all('a', href=True):
-            url = urljoin(page_url, link['href'])
-            # Remove fragments
-            url = url.split('#')[0]
-            
-            if self.is_valid_url(url) and url not in self.visited_urls:
-                links.append(url)
-        
-        return links
+        return self._links_from_tree(HTMLParser(html), page_url)
     
     def crawl(self) -> List[Dict[str, str]]:
         """
@@ -87,34 +224,63 @@ class WebCrawler:
         Returns:
             List of pages with url and content
         """
-        to_visit = [self.base_url]
+        self.pages = list(self.iter_crawl())
+        return self.pages
+    
+    def iter_crawl(self) -> Iterator[Dict[str, str]]:
+        """
+        Crawl the site, yielding each page as soon as it has been parsed
         
-        while to_visit and len(self.visited_urls) < self.max_pages:
-            url = to_visit.pop(0)
-            
-            if url in self.visited_urls:
-                continue
-            
-            logger.info(f"Crawling: {url} ({len(self.visited_urls) + 1}/{self.max_pages})")
-            
-            html, success = self.fetch_page(url)
-            if not success:
-                continue
-            
-            self.visited_urls.add(url)
-            
-            # Extract text
-            text = self.extract_text_from_html(html)
-            
-            if text.strip():
-                self.pages.append({
-                    'url': url,
-                    'content': text
-                })
-            
-            # Get links for further crawling
-            new_links = self.get_links_from_page(html, url)
-            to_visit.extend(new_links)
+        Pages are fetched concurrently by a bounded pool of workers while
+        parsing and frontier bookkeeping stay on the calling thread. Pages
+        are not retained by the crawler; use crawl() to collect them.
         
-        logger.info(f"Crawling completed. Total pages: {len(self.pages)}")
-        return self.pages
+        Yields:
+            Pages with url and content
+        """
+        to_visit = deque([self.base_url])
+        # Every URL ever queued; links are deduplicated against it before
+        # entering the frontier, so the frontier never holds duplicates
+        queued: Set[str] = {self.base_url}
+        total_pages = 0
+        in_flight = {}
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while to_visit or in_flight:
+                # Keep the pool busy without overshooting max_pages
+                while (to_visit and
+                       len(self.visited_urls) + len(in_flight) < self.max_pages):
+                    url = to_visit.popleft()
+                    logger.info("Crawling: %s (%d/%d)", url,
+                                len(self.visited_urls) + len(in_flight) + 1, self.max_pages)
+                    in_flight[executor.submit(self.fetch_page, url)] = url
+                
+                if not in_flight:
+                    break
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = in_flight.pop(future)
+                    html, success = future.result()
+                    if not success:
+                        continue
+                    
+                    self.visited_urls.add(url)
+                    
+                    # Parse once for both text and links
+                    text, new_links = self.parse_page(html, url)
+                    
+                    # Queue links not seen before for further crawling
+                    for link in new_links:
+                        if link not in queued:
+                            queued.add(link)
+                            to_visit.append(link)
+                    
+                    if text.strip():
+                        total_pages += 1
+                        yield {
+                            'url': url,
+                            'content': text
+                        }
+        
+        logger.info("Crawling completed. Total pages: %d", total_pages)
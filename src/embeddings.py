@@ -4,24 +4,58 @@ Generates embeddings for text chunks using sentence-transformers
 """
 import logging
 from typing import List
+import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
 
 class EmbeddingsGenerator:
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", batch_size: int = 64,
+                 use_fp16: bool = False, quantize: bool = False,
+                 warmup: bool = True):
         """
         Initialize embeddings generator
         
         Args:
             model_name: Name of the sentence-transformers model to use
+            batch_size: Number of texts encoded per forward pass
+            use_fp16: Run the model in half precision (CUDA only)
+            quantize: Apply dynamic int8 quantization to Linear layers (CPU only)
+            warmup: Run one small encode so lazy initialization is not paid
+                by the first real request
         """
         logger.info(f"Loading embeddings model: {model_name}")
+        self.model_name = model_name
+        self.batch_size = batch_size
         self.model = SentenceTransformer(model_name)
+        # Numeric mode the vectors are produced in; vectors from different
+        # modes must not be mixed in one cache or index
+        self.precision = 'fp32'
+        
+        if use_fp16 and self.model.device.type == 'cuda':
+            logger.info("Using FP16 weights")
+            self.model.half()
+            self.precision = 'fp16'
+        elif quantize and self.model.device.type == 'cpu':
+            logger.info("Using dynamically quantized int8 Linear layers")
+            self.precision = 'int8'
+            self.model = torch.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        
+        if warmup:
+            self.model.encode(["warmup"] * 2, batch_size=2)
+        
         logger.info("Embeddings model loaded successfully")
     
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    @property
+    def tokenizer(self):
+        """Tokenizer of the underlying model, used for token-based chunking"""
+        return self.model.tokenizer
+    
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for a list of texts
         
@@ -29,11 +63,18 @@ class EmbeddingsGenerator:
             texts: List of text strings
             
         Returns:
-            List of embedding vectors
+            float32 array of shape (len(texts), embedding size)
         """
-        logger.info(f"Generating embeddings for {len(texts)} texts")
-        embeddings = self.model.encode(texts, show_progress_bar=True)
-        return embeddings.tolist()
+        logger.debug("Generating embeddings for %d texts", len(texts))
+        # encode() length-sorts the inputs before slicing them into batches,
+        # so each batch is padded only to its own longest text
+        embeddings = self.model.encode(texts, batch_size=self.batch_size,
+                                       show_progress_bar=True,
+                                       convert_to_numpy=True)
+        # Kept as one contiguous array; boxing every value into a Python
+        # float would cost several times the memory of the array itself.
+        # An fp16 model returns float16, so the float32 contract is enforced
+        return embeddings.astype(np.float32, copy=False)
     
     def generate_single_embedding(self, text: str) -> List[float]:
         """
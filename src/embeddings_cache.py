@@ -0,0 +1,157 @@
+"""
+Embeddings Cache Module
+Persistent on-disk cache in front of EmbeddingsGenerator
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import List
+import numpy as np
+from src.embeddings import EmbeddingsGenerator
+
+logger = logging.getLogger(__name__)
+
+# Keys per SELECT ... IN (...); stays below SQLite's host-parameter limit
+_LOOKUP_BATCH = 500
+
+
+class CachedEmbeddingsGenerator:
+    def __init__(self, inner: EmbeddingsGenerator,
+                 cache_path: str = "./data/embeddings_cache.db",
+                 query_cache_size: int = 1024):
+        """
+        Initialize the cached embeddings generator
+        
+        Args:
+            inner: Embeddings generator used on cache misses
+            cache_path: Path of the SQLite cache file
+            query_cache_size: Number of single-text embeddings kept in memory
+        """
+        self.inner = inner
+        self.model_name = inner.model_name
+        # fp32 keys keep the bare model name so existing caches stay valid
+        self._namespace = (inner.model_name if inner.precision == 'fp32'
+                           else f"{inner.model_name}:{inner.precision}")
+        
+        logger.info(f"Opening embeddings cache at: {cache_path}")
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+        # Vectors are stored as float16 bytes: half the disk and I/O of
+        # float32, far below the precision cosine retrieval can tell apart
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings_fp16 "
+            "(key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        
+        self._single = lru_cache(maxsize=query_cache_size)(self._embed_single)
+    
+    @property
+    def tokenizer(self):
+        """Tokenizer of the underlying model, used for token-based chunking"""
+        return self.inner.tokenizer
+    
+    def _key(self, text: str) -> bytes:
+        """Cache key: SHA-256 of the model name, its precision and the text"""
+        return hashlib.sha256((self._namespace + "\0" + text).encode('utf-8')).digest()
+    
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for a list of texts, encoding only cache misses
+        
+        Args:
+            texts: List of text strings
+        
+        Returns:
+            float32 array of shape (len(texts), embedding size)
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        
+        keys = [self._key(text) for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        found = {}
+        
+        # Look keys up in a few batched queries rather than one per text
+        with self._lock:
+            for start in range(0, len(unique_keys), _LOOKUP_BATCH):
+                batch = unique_keys[start:start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                found.update(self._conn.execute(
+                    f"SELECT key, vector FROM embeddings_fp16 WHERE key IN ({placeholders})",
+                    batch
+                ))
+        
+        # Group misses by key so duplicate texts are only encoded once
+        missing = {}
+        for i, key in enumerate(keys):
+            if key not in found:
+                missing.setdefault(key, []).append(i)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Embeddings cache: %d hits, %d unique misses",
+                         len(texts) - sum(map(len, missing.values())), len(missing))
+        
+        new_embeddings = None
+        if missing:
+            miss_keys = list(missing)
+            new_embeddings = self.inner.generate_embeddings(
+                [texts[missing[key][0]] for key in miss_keys]
+            )
+            
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings_fp16 (key, vector) VALUES (?, ?)",
+                    zip(miss_keys, (vector.tobytes()
+                                    for vector in new_embeddings.astype(np.float16)))
+                )
+                self._conn.commit()
+        
+        # Hits are decoded straight into their rows of one preallocated array
+        if new_embeddings is not None:
+            dim = new_embeddings.shape[1]
+        else:
+            dim = len(next(iter(found.values()))) // 2
+        embeddings = np.empty((len(texts), dim), dtype=np.float32)
+        
+        for i, key in enumerate(keys):
+            if key in found:
+                embeddings[i] = np.frombuffer(found[key], dtype=np.float16)
+        if missing:
+            for row, key in enumerate(miss_keys):
+                embeddings[missing[key]] = new_embeddings[row]
+        
+        return embeddings
+    
+    def generate_query_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for a batch of queries in one pass
+        
+        Queries bypass the on-disk cache so user questions are never persisted.
+        
+        Args:
+            texts: List of query strings
+        
+        Returns:
+            float32 array of shape (len(texts), embedding size)
+        """
+        return self.inner.generate_embeddings(texts)
+    
+    def _embed_single(self, text: str) -> tuple:
+        return tuple(self.inner.generate_single_embedding(text))
+    
+    def generate_single_embedding(self, text: str) -> List[float]:
+        """
+        Generate embedding for a single text, memoized in memory
+        
+        Args:
+            text: Single text string
+        
+        Returns:
+            Embedding vector
+        """
+        return list(self._single(text))
@@ -2,22 +2,29 @@
 Data Indexing Pipeline
 Orchestrates the complete workflow: crawl, clean, embed, and store
 """
+import hashlib
 import logging
 import os
+import queue
+import threading
 from datetime import datetime
 import json
 from src.crawler import WebCrawler
 from src.cleaner import TextCleaner
 from src.embeddings import EmbeddingsGenerator
+from src.embeddings_cache import CachedEmbeddingsGenerator
 from src.vector_db import VectorDatabase
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 class IndexingPipeline:
     def __init__(self, website_url: str, db_path: str = "./data/chroma_db", 
-                 max_pages: int = 50):
+                 max_pages: int = 50, chunk_size: int = 200,
+                 chunk_overlap: int = 20,
+                 cache_path: str = "./data/embeddings_cache.db",
+                 embed_batch_size: int = 512,
+                 crawl_workers: int = 4, crawl_delay: float = 0.5):
         """
         Initialize the indexing pipeline
         
@@ -25,61 +32,146 @@ class IndexingPipeline:
             website_url: URL of the website to crawl
             db_path: Path for the vector database
             max_pages: Maximum pages to crawl
+            chunk_size: Size of each chunk in embedding-model tokens
+            chunk_overlap: Overlap between chunks in tokens
+            cache_path: Path of the on-disk embeddings cache
+            embed_batch_size: Number of chunks embedded and stored per batch
+            crawl_workers: Number of pages fetched concurrently
+            crawl_delay: Average seconds between two requests to the site
         """
         self.website_url = website_url
         self.db_path = db_path
         self.max_pages = max_pages
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.embed_batch_size = embed_batch_size
         
         # Initialize components
-        self.crawler = WebCrawler(website_url, max_pages)
+        self.crawler = WebCrawler(website_url, max_pages,
+                                  max_workers=crawl_workers, delay=crawl_delay)
         self.cleaner = TextCleaner()
-        self.embeddings_gen = EmbeddingsGenerator()
+        self.embeddings_gen = CachedEmbeddingsGenerator(EmbeddingsGenerator(), cache_path)
         self.vector_db = VectorDatabase(db_path)
         self.vector_db.create_collection()
         
+    def _crawl_into(self, page_queue: queue.Queue, stop: threading.Event,
+                    errors: list):
+        """Producer thread: push crawled pages onto the queue, then a sentinel"""
+        try:
+            for page in self.crawler.iter_crawl():
+                if stop.is_set():
+                    break
+                page_queue.put(page)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            page_queue.put(None)
+    
+    def _store_from(self, store_queue: queue.Queue, errors: list):
+        """Writer thread: add (ids, contents, sources, embeddings) batches to the vector DB"""
+        while True:
+            batch = store_queue.get()
+            if batch is None:
+                return
+            if errors:
+                # Keep draining so the embedding stage never blocks on a dead writer
+                continue
+            try:
+                self.vector_db.add_batch(*batch)
+            except Exception as e:
+                errors.append(e)
+    
     def run(self):
         """Run the complete indexing pipeline"""
         logger.info("=" * 50)
         logger.info("Starting RAG Indexing Pipeline")
         logger.info("=" * 50)
         
-        # Step 1: Crawl
-        logger.info("\n[Step 1/4] Crawling website...")
-        pages = self.crawler.crawl()
-        logger.info(f"Crawled {len(pages)} pages")
+        # Crawling, embedding and storing overlap: the crawler and the DB
+        # writer run in their own threads, connected by bounded queues so a
+        # slow stage applies backpressure instead of buffering everything
+        logger.info("\nCrawling, chunking, embedding and storing as pages arrive...")
+        page_queue = queue.Queue(maxsize=32)
+        store_queue = queue.Queue(maxsize=4)
+        stop = threading.Event()
+        errors = []
         
-        if not pages:
-            logger.error("No pages crawled. Exiting.")
-            return False
+        crawler_thread = threading.Thread(
+            target=self._crawl_into, args=(page_queue, stop, errors), daemon=True
+        )
+        writer_thread = threading.Thread(
+            target=self._store_from, args=(store_queue, errors), daemon=True
+        )
+        crawler_thread.start()
+        writer_thread.start()
         
-        # Step 2: Clean and chunk
-        logger.info("\n[Step 2/4] Cleaning and chunking content...")
-        documents = []
-        all_chunks = []
+        total_pages = 0
+        total_chunks = 0
+        # Digests of chunks already kept: pagination, print views and
+        # trailing-slash variants repeat content that must not be embedded twice
+        seen_chunks = set()
+        duplicates = 0
+        # Pending batch kept as parallel lists rather than one dict per chunk
+        ids, contents, sources = [], [], []
         
-        for idx, page in enumerate(pages):
-            chunks = self.cleaner.process_content(page['content'])
+        try:
+            while True:
+                page = page_queue.get()
+                if page is None or errors:
+                    # Stop as soon as the crawler or the DB writer has failed
+                    break
+                
+                total_pages += 1
+                
+                chunks = self.cleaner.iter_process_content(
+                    page['content'],
+                    chunk_size=self.chunk_size,
+                    overlap=self.chunk_overlap,
+                    tokenizer=self.embeddings_gen.tokenizer
+                )
+                
+                for chunk in chunks:
+                    digest = hashlib.blake2b(chunk.encode('utf-8'), digest_size=8).digest()
+                    if digest in seen_chunks:
+                        duplicates += 1
+                        continue
+                    seen_chunks.add(digest)
+                    
+                    # Content-derived ids are the same on every run, whatever
+                    # order pages finish downloading in
+                    ids.append(digest.hex())
+                    contents.append(chunk)
+                    sources.append(page['url'])
+                
+                if len(ids) >= self.embed_batch_size:
+                    self._embed_batch(ids, contents, sources, store_queue)
+                    total_chunks += len(ids)
+                    ids, contents, sources = [], [], []
             
-            for chunk_idx, chunk in enumerate(chunks):
-                doc_id = f"doc_{idx}_{chunk_idx}"
-                documents.append({
-                    'id': doc_id,
-                    'content': chunk,
-                    'source': page['url']
-                })
-                all_chunks.append(chunk)
+            if ids and not errors:
+                self._embed_batch(ids, contents, sources, store_queue)
+                total_chunks += len(ids)
+        finally:
+            stop.set()
+            store_queue.put(None)
+            # Unblock the crawler if it is waiting on a full queue
+            while crawler_thread.is_alive():
+                try:
+                    page_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            writer_thread.join()
         
-        logger.info(f"Created {len(documents)} document chunks")
+        if errors:
+            raise errors[0]
         
-        # Step 3: Generate embeddings
-        logger.info("\n[Step 3/4] Generating embeddings...")
-        embeddings = self.embeddings_gen.generate_embeddings(all_chunks)
-        logger.info(f"Generated {len(embeddings)} embeddings")
+        logger.info(f"Crawled {total_pages} pages")
+        logger.info(f"Created {total_chunks} document chunks "
+                    f"({duplicates} duplicates skipped)")
         
-        # Step 4: Store in vector database
-        logger.info("\n[Step 4/4] Storing in vector database...")
-        self.vector_db.add_documents(documents, embeddings)
-        self.vector_db.persist()
+        if not total_pages:
+            logger.error("No pages crawled. Exiting.")
+            return False
         
         logger.info("\n" + "=" * 50)
         logger.info("Indexing Pipeline Completed Successfully!")
@@ -89,8 +181,8 @@ class IndexingPipeline:
         metadata = {
             'timestamp': datetime.now().isoformat(),
             'website_url': self.website_url,
-            'total_pages_crawled': len(pages),
-            'total_chunks': len(documents),
+            'total_pages_crawled': total_pages,
+            'total_chunks': total_chunks,
             'db_path': self.db_path
         }
         
@@ -99,14 +191,25 @@ class IndexingPipeline:
             json.dump(metadata, f, indent=2)
         
         return True
+    
+    def _embed_batch(self, ids: list, contents: list, sources: list,
+                     store_queue: queue.Queue):
+        """Embed a batch of documents and hand it to the DB writer"""
+        embeddings = self.embeddings_gen.generate_embeddings(contents)
+        store_queue.put((ids, contents, sources, embeddings))
 
 
 if __name__ == "__main__":
     from dotenv import load_dotenv
     load_dotenv()
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
     
     website_url = os.getenv('TARGET_WEBSITE', 'https://example.com')
     db_path = os.getenv('VECTOR_DB_PATH', './data/chroma_db')
+    cache_path = os.getenv('EMBEDDINGS_CACHE_PATH', './data/embeddings_cache.db')
     
-    pipeline = IndexingPipeline(website_url, db_path, max_pages=50)
+    pipeline = IndexingPipeline(website_url, db_path, max_pages=50,
+                                cache_path=cache_path,
+                                crawl_workers=int(os.getenv('CRAWL_WORKERS', 4)),
+                                crawl_delay=float(os.getenv('CRAWL_DELAY', 0.5)))
     pipeline.run()
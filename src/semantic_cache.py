@@ -0,0 +1,105 @@
+"""
+Semantic Cache Module
+Caches results for near-duplicate query embeddings by cosine similarity
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    def __init__(self, threshold: float = 0.95, max_entries: int = 1024,
+                 ttl: float = 3600.0):
+        """
+        Initialize semantic cache
+        
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of cached entries (FIFO eviction)
+            ttl: Seconds after which a cached entry is no longer served
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        
+        # Ring buffer of normalized embeddings, scanned with one matrix-vector
+        # product per lookup; allocated once the embedding size is known
+        self._vectors: Optional[np.ndarray] = None
+        self._namespace_ids = np.full(max_entries, -1, dtype=np.int64)
+        self._added_at = np.zeros(max_entries, dtype=np.float64)
+        self._values: List[Any] = [None] * max_entries
+        self._namespaces: Dict[Hashable, int] = {}
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+    
+    def _normalize(self, embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def lookup(self, embedding, namespace: Hashable = None) -> Optional[Any]:
+        """
+        Find a cached value for a similar embedding
+        
+        Args:
+            embedding: Query embedding vector
+            namespace: Extra key the cached value depends on (e.g. top_k)
+        
+        Returns:
+            Cached value, or None on a miss
+        """
+        vector = self._normalize(embedding)
+        
+        with self._lock:
+            namespace_id = self._namespaces.get(namespace)
+            if namespace_id is None or self._size == 0:
+                return None
+            
+            scores = self._vectors[:self._size] @ vector
+            scores[self._namespace_ids[:self._size] != namespace_id] = -np.inf
+            scores[self._added_at[:self._size] < time.monotonic() - self.ttl] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            return self._values[best]
+    
+    def add(self, embedding, value: Any, namespace: Hashable = None):
+        """
+        Cache a value for an embedding
+        
+        Args:
+            embedding: Query embedding vector
+            value: Value to return for similar queries
+            namespace: Extra key the cached value depends on (e.g. top_k)
+        """
+        vector = self._normalize(embedding)
+        
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, vector.shape[0]),
+                                         dtype=np.float32)
+            
+            # Oldest slot is overwritten once the buffer is full
+            slot = self._next
+            self._vectors[slot] = vector
+            self._namespace_ids[slot] = self._namespaces.setdefault(
+                namespace, len(self._namespaces)
+            )
+            self._values[slot] = value
+            self._added_at[slot] = time.monotonic()
+            self._next = (slot + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
+    
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._namespace_ids.fill(-1)
+            self._values = [None] * self.max_entries
+            self._namespaces.clear()
+            self._next = 0
+            self._size = 0
@@ -5,7 +5,8 @@ Manages storage and retrieval of embeddings using ChromaDB
 import logging
 import chromadb
 from chromadb.config import Settings
-from typing import List, Dict
+from typing import List, Dict, Union
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -20,13 +21,12 @@ class VectorDatabase:
         """
         logger.info(f"Initializing ChromaDB at: {db_path}")
         
-        settings = Settings(
-            chroma_db_impl="duckdb+parquet",
-            persist_directory=db_path,
-            anonymized_telemetry=False,
+        # The persistent client keeps the HNSW index on disk and writes
+        # through automatically, so nothing is rebuilt on start-up
+        self.client = chromadb.PersistentClient(
+            path=db_path,
+            settings=Settings(anonymized_telemetry=False)
         )
-        
-        self.client = chromadb.Client(settings)
         self.collection = None
         
     def create_collection(self, collection_name: str = "rag_documents"):
@@ -34,33 +34,61 @@ class VectorDatabase:
         logger.info(f"Creating collection: {collection_name}")
         self.collection = self.client.get_or_create_collection(
             name=collection_name,
-            metadata={"hnsw:space": "cosine"}
+            metadata={
+                "hnsw:space": "cosine",
+                "hnsw:construction_ef": 200,
+                "hnsw:M": 32,
+                "hnsw:search_ef": 64
+            }
         )
         logger.info("Collection created successfully")
     
-    def add_documents(self, documents: List[Dict], embeddings: List[List[float]]):
+    def add_documents(self, documents: List[Dict],
+                      embeddings: Union[np.ndarray, List[List[float]]]):
         """
         Add documents and embeddings to the collection
         
         Args:
             documents: List of dicts with 'id', 'content', 'source' keys
-            embeddings: List of embedding vectors
+            embeddings: Embedding vectors, as an array or a list of lists
+        """
+        self.add_batch(
+            [doc['id'] for doc in documents],
+            [doc['content'] for doc in documents],
+            [doc.get('source', 'unknown') for doc in documents],
+            embeddings
+        )
+    
+    def add_batch(self, ids: List[str], contents: List[str], sources: List[str],
+                  embeddings: Union[np.ndarray, List[List[float]]]):
+        """
+        Add documents given as parallel lists to the collection
+        
+        Args:
+            ids: Document ids
+            contents: Document texts
+            sources: Source URL of each document
+            embeddings: Embedding vectors, as an array or a list of lists
         """
         if not self.collection:
             self.create_collection()
         
-        ids = [doc['id'] for doc in documents]
-        metadatas = [{'source': doc.get('source', 'unknown')} for doc in documents]
-        documents_text = [doc['content'] for doc in documents]
-        
-        logger.info(f"Adding {len(documents)} documents to collection")
-        self.collection.add(
+        logger.debug("Adding %d documents to collection", len(ids))
+        # Upsert so re-indexing into an existing database replaces documents
+        # whose ids are already present instead of silently skipping them
+        self.collection.upsert(
             ids=ids,
             embeddings=embeddings,
-            documents=documents_text,
-            metadatas=metadatas
+            documents=contents,
+            metadatas=[{'source': source} for source in sources]
         )
-        logger.info("Documents added successfully")
+        logger.debug("Documents added successfully")
+    
+    def get_collection_count(self) -> int:
+        """Return the number of documents in the collection"""
+        if not self.collection:
+            return 0
+        return self.collection.count()
     
     def search(self, query_embedding: List[float], n_results: int = 5) -> Dict:
         """
@@ -73,17 +101,26 @@ class VectorDatabase:
         Returns:
             Search results with documents and distances
         """
+        return self.search_batch([query_embedding], n_results)
+    
+    def search_batch(self, query_embeddings: Union[np.ndarray, List[List[float]]],
+                     n_results: int = 5) -> Dict:
+        """
+        Search for similar documents for several queries in one call
+        
+        Args:
+            query_embeddings: Embedding vectors of the queries
+            n_results: Number of results to return per query
+            
+        Returns:
+            Search results with one list of documents and distances per query
+        """
         if not self.collection:
             raise ValueError("Collection not initialized")
         
         results = self.collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=query_embeddings,
             n_results=n_results
         )
         
         return results
-    
-    def persist(self):
-        """Persist the database to disk"""
-        logger.info("Persisting database")
-        self.client.persist()